@@ -2,12 +2,25 @@
 """Build colophon page from git history."""
 import json
 import subprocess
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-import yaml
+from site_utils import CACHE_DIR, load_config
+
+COMMITS_CACHE_PATH = CACHE_DIR / 'colophon-commits.json'
+
+COMMIT_TEMPLATE = """
+    <div class="commit">
+        <div class="commit-header">
+            {link} &mdash; <span class="author">{author}</span>
+        </div>
+        <div class="message">{message}</div>
+        <div class="date">{date}</div>
+    </div>
+"""
 
 
 @dataclass
@@ -20,19 +33,38 @@ class Commit:
     message: str
 
 
-def load_config() -> dict:
-    """Load configuration from _config.yml."""
-    config_path = Path('_config.yml')
-    if not config_path.exists():
-        return {}
+def load_cached_commits(tip: str, limit: int) -> Optional[list[Commit]]:
+    """Load commits cached for the given HEAD, or None on a miss."""
+    try:
+        with COMMITS_CACHE_PATH.open('r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('tip') != tip or cached.get('limit') != limit:
+            return None
+        return [Commit(**c) for c in cached['commits']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f) or {}
+
+def save_cached_commits(tip: str, limit: int, commits: list[Commit]):
+    """Cache commits keyed by HEAD so unchanged history skips git log."""
+    try:
+        COMMITS_CACHE_PATH.parent.mkdir(exist_ok=True)
+        with COMMITS_CACHE_PATH.open('w', encoding='utf-8') as f:
+            json.dump({
+                'tip': tip,
+                'limit': limit,
+                'commits': [asdict(c) for c in commits]
+            }, f)
+    except OSError as e:
+        print(f"Warning: Could not write commit cache: {e}")
 
 
 def get_git_commits(limit: int = 50) -> list[Commit]:
     """Get recent git commits.
 
+    Results are cached in .cache/ keyed by the HEAD commit, so the
+    git log walk only runs when history has changed.
+
     Args:
         limit: Maximum number of commits to retrieve
 
@@ -40,12 +72,24 @@ def get_git_commits(limit: int = 50) -> list[Commit]:
         List of Commit objects
     """
     try:
-        # Git log format: hash|author|date|message
+        tip = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+
+        cached = load_cached_commits(tip, limit)
+        if cached is not None:
+            return cached
+
+        # Git log format: hash, author, date, message separated by \x1f and
+        # terminated by \x1e, so '|' in names or subjects is not a delimiter
         result = subprocess.run(
             [
                 'git', 'log',
                 f'-{limit}',
-                '--pretty=format:%H|%an|%ai|%s',
+                '--pretty=format:%H%x1f%an%x1f%ai%x1f%s%x1e',
                 '--no-merges'
             ],
             capture_output=True,
@@ -54,15 +98,12 @@ def get_git_commits(limit: int = 50) -> list[Commit]:
         )
 
         commits = []
-        for line in result.stdout.strip().split('\n'):
-            if not line:
+        for record in result.stdout.split('\x1e'):
+            record = record.lstrip('\n')
+            if not record:
                 continue
 
-            parts = line.split('|', 3)
-            if len(parts) != 4:
-                continue
-
-            hash_full, author, date_str, message = parts
+            hash_full, author, date_str, message = record.split('\x1f', 3)
 
             commits.append(Commit(
                 hash=hash_full,
@@ -72,6 +113,7 @@ def get_git_commits(limit: int = 50) -> list[Commit]:
                 message=message
             ))
 
+        save_cached_commits(tip, limit, commits)
         return commits
 
     except subprocess.CalledProcessError as e:
@@ -82,6 +124,7 @@ def get_git_commits(limit: int = 50) -> list[Commit]:
         return []
 
 
+@lru_cache(maxsize=256)
 def format_date(date_str: str) -> str:
     """Format ISO date to readable format."""
     try:
@@ -91,35 +134,19 @@ def format_date(date_str: str) -> str:
         return date_str
 
 
-def generate_colophon_html(site_title: str, commits: list[Commit], repo_url: Optional[str]) -> str:
-    """Generate complete colophon HTML.
+def iter_colophon_html(site_title: str, commits: list[Commit],
+                       repo_url: Optional[str]) -> Iterator[str]:
+    """Generate complete colophon HTML piece by piece.
 
     Args:
         site_title: Site title from config
         commits: List of git commits
         repo_url: Repository URL (optional)
 
-    Returns:
-        Complete HTML document
+    Yields:
+        Chunks of the HTML document, in order
     """
-    commit_html = []
-
-    for commit in commits:
-        commit_link = f'<code>{commit.short_hash}</code>'
-        if repo_url:
-            commit_link = f'<a href="{repo_url}/commit/{commit.hash}">{commit_link}</a>'
-
-        commit_html.append(f"""
-    <div class="commit">
-        <div class="commit-header">
-            {commit_link} &mdash; <span class="author">{commit.author}</span>
-        </div>
-        <div class="message">{commit.message}</div>
-        <div class="date">{format_date(commit.date)}</div>
-    </div>
-""")
-
-    return f"""<!DOCTYPE html>
+    yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -197,7 +224,24 @@ def generate_colophon_html(site_title: str, commits: list[Commit], repo_url: Opt
         Recent changes and updates to this collection of tools.
     </p>
 
-{''.join(commit_html) if commits else '<p>No git history available.</p>'}
+"""
+
+    if not commits:
+        yield '<p>No git history available.</p>'
+
+    for commit in commits:
+        commit_link = f'<code>{commit.short_hash}</code>'
+        if repo_url:
+            commit_link = f'<a href="{repo_url}/commit/{commit.hash}">{commit_link}</a>'
+
+        yield COMMIT_TEMPLATE.format(
+            link=commit_link,
+            author=commit.author,
+            message=commit.message,
+            date=format_date(commit.date)
+        )
+
+    yield """
 
 </body>
 </html>
@@ -217,15 +261,13 @@ def main():
     commits = get_git_commits(limit=50)
     print(f"Found {len(commits)} commit(s)")
 
-    # Generate HTML
-    html = generate_colophon_html(site_title, commits, repo_url)
-
-    # Write to dist/colophon.html
+    # Write dist/colophon.html as it is generated
     dist_dir = Path('dist')
     dist_dir.mkdir(exist_ok=True)
 
     colophon_path = dist_dir / 'colophon.html'
-    colophon_path.write_text(html, encoding='utf-8')
+    with colophon_path.open('w', encoding='utf-8', buffering=64 * 1024) as f:
+        f.writelines(iter_colophon_html(site_title, commits, repo_url))
 
     print(f"✓ Wrote colophon to {colophon_path}")
 
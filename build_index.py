@@ -1,22 +1,19 @@
 #!/usr/bin/env python3
 """Build index page from gathered tool metadata."""
 import json
+import os
 import shutil
 from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-import yaml
-
-
-def load_config() -> dict:
-    """Load configuration from _config.yml."""
-    config_path = Path('_config.yml')
-    if not config_path.exists():
-        return {}
-
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f) or {}
+from site_utils import (
+    build_is_current,
+    find_html_files,
+    inputs_fingerprint,
+    load_config,
+    write_build_stamp,
+)
 
 
 def load_tools() -> list[dict]:
@@ -64,29 +61,17 @@ def generate_tool_html(tool: dict) -> str:
 """
 
 
-def generate_index_html(config: dict, tools: list[dict]) -> str:
-    """Generate complete index HTML."""
+def iter_index_html(config: dict, tools: list[dict]) -> Iterator[str]:
+    """Generate complete index HTML piece by piece.
+
+    Yields chunks for the caller to write out directly, so the whole page
+    is never held in memory as one string.
+    """
     site_title = config.get('title', 'Tools')
     site_description = config.get('description', 'A collection of tools')
     categories_enabled = config.get('categories_enabled', False)
 
-    # Generate tools HTML
-    tools_html = []
-
-    if categories_enabled and any(t.get('category') for t in tools):
-        # Group by category
-        grouped = group_by_category(tools)
-
-        for category, category_tools in sorted(grouped.items()):
-            tools_html.append(f'<h2 class="category">{category}</h2>')
-            tools_html.extend(generate_tool_html(t) for t in category_tools)
-    else:
-        # Flat list
-        tools_html.extend(generate_tool_html(t) for t in tools)
-
-    tools_section = ''.join(tools_html) if tools else '<p>No tools available yet.</p>'
-
-    return f"""<!DOCTYPE html>
+    yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -169,7 +154,22 @@ def generate_index_html(config: dict, tools: list[dict]) -> str:
     <h1>{site_title}</h1>
     <p class="description">{site_description}</p>
 
-{tools_section}
+"""
+
+    if not tools:
+        yield '<p>No tools available yet.</p>'
+    elif categories_enabled and any(t.get('category') for t in tools):
+        # Group by category
+        grouped = group_by_category(tools)
+
+        for category, category_tools in sorted(grouped.items()):
+            yield f'<h2 class="category">{category}</h2>'
+            yield from (generate_tool_html(t) for t in category_tools)
+    else:
+        # Flat list
+        yield from (generate_tool_html(t) for t in tools)
+
+    yield """
 
     <div class="footer">
         <a href="colophon.html">Colophon</a>
@@ -179,15 +179,61 @@ def generate_index_html(config: dict, tools: list[dict]) -> str:
 """
 
 
-def copy_assets():
+def copy_html_files(html_files: list[Path], dist_dir: Path) -> tuple[int, int]:
+    """Copy tool HTML files to dist/, skipping ones that are already current.
+
+    A destination is considered current when it has the same size and is at
+    least as new as its source. Set BUILD_HARDLINK=1 to hardlink instead of
+    copying (falls back to a copy if linking fails, e.g. across devices).
+
+    Args:
+        html_files: Tool HTML files to copy
+        dist_dir: Output directory
+
+    Returns:
+        Tuple of (copied_count, skipped_count)
+    """
+    use_hardlink = os.environ.get('BUILD_HARDLINK') == '1'
+    copied = skipped = 0
+
+    for html_file in html_files:
+        dst_path = dist_dir / html_file.name
+        src = html_file.stat()
+
+        try:
+            dst = dst_path.stat()
+        except FileNotFoundError:
+            dst = None
+
+        if dst and dst.st_size == src.st_size and dst.st_mtime_ns >= src.st_mtime_ns:
+            skipped += 1
+            continue
+
+        if use_hardlink:
+            dst_path.unlink(missing_ok=True)
+            try:
+                os.link(html_file, dst_path)
+                copied += 1
+                continue
+            except OSError:
+                pass
+
+        # Byte-for-byte copy (no decode/encode; sendfile on Linux). copy2
+        # also carries the source mtime over, which the check above relies on
+        shutil.copy2(html_file, dst_path)
+        copied += 1
+
+    return copied, skipped
+
+
+def copy_assets(html_files: list[Path]):
     """Copy HTML tools and optional assets to dist/."""
     dist_dir = Path('dist')
     dist_dir.mkdir(exist_ok=True)
 
     # Copy all *.html files (except index.html)
-    html_files = [f for f in Path('.').glob('*.html') if f.name != 'index.html']
-    for html_file in html_files:
-        shutil.copy2(html_file, dist_dir / html_file.name)
+    copied, skipped = copy_html_files(html_files, dist_dir)
+    print(f"  Copied {copied} HTML file(s), {skipped} unchanged")
 
     # Copy assets directory if it exists
     assets_dir = Path('assets')
@@ -203,25 +249,37 @@ def main():
     """Main entry point."""
     print("=== Building index ===")
 
+    # Skip when tools.json, config, tool HTML and assets are all unchanged
+    dist_dir = Path('dist')
+    html_files = find_html_files()
+    inputs = [Path('tools.json'), Path('_config.yml'), *html_files,
+              Path(__file__), Path(__file__).with_name('site_utils.py'),
+              *Path('assets').rglob('*')]
+    fingerprint = inputs_fingerprint(inputs)
+    outputs = [dist_dir / 'index.html', *(dist_dir / f.name for f in html_files)]
+    if Path('assets').is_dir():
+        outputs.append(dist_dir / 'assets')
+    if build_is_current('index-stamp', fingerprint, *outputs):
+        print("✓ Inputs unchanged; keeping dist/ as is")
+        return
+
     config = load_config()
     tools = load_tools()
 
     print(f"Loaded {len(tools)} tool(s)")
 
-    # Generate index HTML
-    html = generate_index_html(config, tools)
-
-    # Write to dist/index.html
-    dist_dir = Path('dist')
+    # Write dist/index.html as it is generated
     dist_dir.mkdir(exist_ok=True)
 
     index_path = dist_dir / 'index.html'
-    index_path.write_text(html, encoding='utf-8')
+    with index_path.open('w', encoding='utf-8', buffering=64 * 1024) as f:
+        f.writelines(iter_index_html(config, tools))
     print(f"✓ Wrote {index_path}")
 
     # Copy assets
-    copy_assets()
+    copy_assets(html_files)
 
+    write_build_stamp('index-stamp', fingerprint)
     print(f"✓ Build complete ({len(tools)} tool(s))")
 
 
@@ -4,14 +4,37 @@
 Scans HTML files, extracts metadata from .docs.md files, and optionally
 uses LLM to generate descriptions if missing.
 """
+import asyncio
+import hashlib
 import json
 import os
-import re
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Optional
 
-import yaml
+try:
+    import orjson
+except ImportError:  # optional; stdlib json writes the same output
+    orjson = None
+
+from site_utils import (
+    CACHE_DIR,
+    build_is_current,
+    clear_build_stamp,
+    extract_description,
+    extract_title,
+    find_html_files,
+    inputs_fingerprint,
+    write_build_stamp,
+)
+
+LLM_MODEL = "claude-3-5-sonnet-20241022"
+LLM_MAX_CONCURRENCY = 8
+LLM_CACHE_PATH = CACHE_DIR / 'llm-descriptions.json'
+
+NO_DESCRIPTION = "No description available."
 
 
 @dataclass
@@ -28,151 +51,215 @@ class ToolMetadata:
         if self.tags is None:
             self.tags = []
 
+    def to_dict(self) -> dict:
+        """Shallow dict for JSON output (no recursive copy like asdict)."""
+        return {
+            'slug': self.slug,
+            'title': self.title,
+            'description': self.description,
+            'url': self.url,
+            'category': self.category,
+            'tags': self.tags,
+        }
 
-def extract_title_from_html(html_path: Path) -> str:
-    """Extract title from HTML <title> tag."""
-    try:
-        content = html_path.read_text('utf-8')
-        match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE | re.DOTALL)
-        if match:
-            return match.group(1).strip()
-    except Exception as e:
-        print(f"Warning: Could not extract title from {html_path}: {e}")
 
-    # Fallback to filename
-    return html_path.stem.replace('-', ' ').title()
+def build_llm_prompt(html_path: Path, title: str) -> str:
+    """Build the description prompt for a tool from its title and HTML."""
+    # Read HTML content for context; read(n) stops after n characters
+    with html_path.open('r', encoding='utf-8', errors='replace') as f:
+        html_content = f.read(2000)  # First 2KB
 
+    return f"""Generate a concise 1-sentence description for this web tool.
 
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Parse YAML frontmatter from markdown content.
+Title: {title}
+HTML snippet:
+{html_content}
 
-    Returns:
-        Tuple of (frontmatter_dict, remaining_content)
-    """
-    if not content.startswith('---'):
-        return {}, content
+Return ONLY the description, no preamble."""
 
-    try:
-        # Find closing ---
-        parts = content.split('---', 2)
-        if len(parts) < 3:
-            return {}, content
-
-        frontmatter = yaml.safe_load(parts[1]) or {}
-        remaining = parts[2].strip()
-        return frontmatter, remaining
-    except Exception as e:
-        print(f"Warning: Could not parse frontmatter: {e}")
-        return {}, content
 
+def llm_cache_key(prompt: str) -> str:
+    """Cache key for a prompt: its SHA-256 plus the model that answers it."""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest() + ':' + LLM_MODEL
 
-def extract_description_from_docs(docs_path: Path) -> tuple[str, dict]:
-    """Extract description and metadata from .docs.md file.
-
-    Returns:
-        Tuple of (description, metadata_dict)
-    """
-    if not docs_path.exists():
-        return "", {}
 
+def load_llm_cache() -> dict:
+    """Load cached LLM descriptions, or an empty cache if none/unreadable."""
     try:
-        content = docs_path.read_text('utf-8').strip()
-        frontmatter, body = parse_frontmatter(content)
+        with LLM_CACHE_PATH.open('r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-        # Find first non-empty, non-heading line
-        for line in body.splitlines():
-            line = line.strip()
-            if line and not line.startswith('#'):
-                return line, frontmatter
 
-        return "", frontmatter
-    except Exception as e:
-        print(f"Warning: Could not read {docs_path}: {e}")
-        return "", {}
+def save_llm_cache(cache: dict):
+    """Write the LLM description cache atomically."""
+    try:
+        LLM_CACHE_PATH.parent.mkdir(exist_ok=True)
+        tmp_path = LLM_CACHE_PATH.with_suffix('.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, LLM_CACHE_PATH)
+    except OSError as e:
+        print(f"Warning: Could not write LLM cache: {e}")
 
 
-def generate_description_with_llm(html_path: Path, title: str) -> Optional[str]:
-    """Generate description using Anthropic LLM if API key available.
+async def generate_description_with_llm(client, semaphore: asyncio.Semaphore,
+                                        html_path: Path, prompt: str) -> str:
+    """Generate a description for one tool using the shared async client.
 
     Returns:
-        Generated description or None if unavailable/failed
+        Generated description (raises on API failure)
     """
+    async with semaphore:
+        message = await client.messages.create(
+            model=LLM_MODEL,
+            max_tokens=150,
+            messages=[{"role": "user", "content": prompt}]
+        )
+
+    description = message.content[0].text.strip()
+    print(f"  → LLM generated description for {html_path.name}")
+    return description
+
+
+def llm_enabled() -> bool:
+    """Whether LLM descriptions can be generated in this environment."""
     api_key = os.environ.get('ANTHROPIC_API_KEY')
     dry_run = os.environ.get('LLM_DRY_RUN', '').lower() == 'true'
+    return bool(api_key) and not dry_run and find_spec('anthropic') is not None
 
-    if not api_key or dry_run:
-        return None
 
-    try:
-        from anthropic import Anthropic
+def generate_descriptions_with_llm(pending: list[tuple[Path, str]]) -> list[Optional[str]]:
+    """Generate descriptions using Anthropic LLM if API key available.
 
-        # Read HTML content for context
-        html_content = html_path.read_text('utf-8')[:2000]  # First 2KB
+    Answers are cached in .cache/ keyed by prompt hash and model, so an
+    unchanged tool never hits the API twice. Remaining requests share one
+    client (and its connection pool) and run concurrently, at most
+    LLM_MAX_CONCURRENCY at a time.
 
-        client = Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=150,
-            messages=[{
-                "role": "user",
-                "content": f"""Generate a concise 1-sentence description for this web tool.
+    Args:
+        pending: List of (html_path, title) pairs needing a description
 
-Title: {title}
-HTML snippet:
-{html_content}
+    Returns:
+        Generated descriptions in input order, None where unavailable/failed
+    """
+    if not pending:
+        return []
+
+    # An unreadable file only costs that tool its description
+    prompts = []
+    for html_path, title in pending:
+        try:
+            prompts.append(build_llm_prompt(html_path, title))
+        except OSError as e:
+            print(f"  → LLM generation failed for {html_path.name}: {e}")
+            prompts.append(None)
+    keys = [llm_cache_key(prompt) if prompt else None for prompt in prompts]
+
+    cache = load_llm_cache()
+    descriptions = [cache.get(key) if key else None for key in keys]
+    misses = [i for i, description in enumerate(descriptions)
+              if description is None and keys[i]]
+
+    for html_path, description in zip((p for p, _ in pending), descriptions):
+        if description is not None:
+            print(f"  → Cached LLM description for {html_path.name}")
 
-Return ONLY the description, no preamble."""
-            }]
-        )
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    dry_run = os.environ.get('LLM_DRY_RUN', '').lower() == 'true'
 
-        description = message.content[0].text.strip()
-        print(f"  → LLM generated description for {html_path.name}")
-        return description
+    if not misses or not api_key or dry_run:
+        return descriptions
 
+    try:
+        from anthropic import AsyncAnthropic
     except ImportError:
         print("  → anthropic package not installed, skipping LLM")
-        return None
+        return descriptions
+
+    async def run_batch():
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        async with AsyncAnthropic(api_key=api_key) as client:
+            return await asyncio.gather(
+                *(generate_description_with_llm(client, semaphore, pending[i][0], prompts[i])
+                  for i in misses),
+                return_exceptions=True
+            )
+
+    try:
+        results = asyncio.run(run_batch())
     except Exception as e:
         print(f"  → LLM generation failed: {e}")
-        return None
+        return descriptions
+
+    generated = 0
+    for i, result in zip(misses, results):
+        # gather() also returns BaseExceptions such as CancelledError
+        if isinstance(result, BaseException):
+            print(f"  → LLM generation failed for {pending[i][0].name}: {result!r}")
+            continue
+        descriptions[i] = cache[keys[i]] = result
+        generated += 1
+
+    if generated:
+        save_llm_cache(cache)
+
+    return descriptions
+
+
+def gather_tool(html_file: Path) -> ToolMetadata:
+    """Gather metadata for a single tool.
+
+    Args:
+        html_file: Path to the tool's HTML file
+
+    Returns:
+        ToolMetadata for the tool
+    """
+    slug = html_file.stem
+    title = extract_title(html_file)
+
+    # Try to get description from .docs.md (LLM fallback runs in gather_tools)
+    docs_file = html_file.with_suffix('.docs.md')
+    description, metadata = extract_description(docs_file)
+
+    return ToolMetadata(
+        slug=slug,
+        title=title,
+        description=description,
+        url=html_file.name,
+        category=metadata.get('category'),
+        tags=metadata.get('tags', [])
+    )
 
 
 def gather_tools() -> list[ToolMetadata]:
     """Scan directory and gather metadata for all tools.
 
+    Files are read on a thread pool so disk I/O overlaps; results keep
+    the sorted file order.
+
     Returns:
         List of ToolMetadata objects
     """
-    tools = []
-    html_files = sorted([
-        f for f in Path('.').glob('*.html')
-        if f.name != 'index.html'
-    ])
+    html_files = find_html_files()
 
     print(f"Found {len(html_files)} tool(s)")
 
-    for html_file in html_files:
-        slug = html_file.stem
-        title = extract_title_from_html(html_file)
-
-        # Try to get description from .docs.md
-        docs_file = html_file.with_suffix('.docs.md')
-        description, metadata = extract_description_from_docs(docs_file)
-
-        # Fallback to LLM if no description
-        if not description:
-            print(f"  {slug}: No description in .docs.md, trying LLM...")
-            llm_desc = generate_description_with_llm(html_file, title)
-            description = llm_desc or "No description available."
-
-        tools.append(ToolMetadata(
-            slug=slug,
-            title=title,
-            description=description,
-            url=html_file.name,
-            category=metadata.get('category'),
-            tags=metadata.get('tags', [])
-        ))
+    with ThreadPoolExecutor(max_workers=min(32, len(html_files) or 1)) as executor:
+        tools = list(executor.map(gather_tool, html_files))
+
+    # Fallback to LLM for all tools without a description in one batch
+    pending = [tool for tool in tools if not tool.description]
+    for tool in pending:
+        print(f"  {tool.slug}: No description in .docs.md, trying LLM...")
+
+    descriptions = generate_descriptions_with_llm(
+        [(Path(tool.url), tool.title) for tool in pending]
+    )
+    for tool, description in zip(pending, descriptions):
+        tool.description = description or NO_DESCRIPTION
 
     return tools
 
@@ -181,19 +268,48 @@ def main():
     """Main entry point."""
     print("=== Gathering tool metadata ===")
 
+    # Skip when no tool HTML or .docs.md file changed since the last run and
+    # LLM availability (which decides missing descriptions) is the same
+    output_path = Path('tools.json')
+    html_files = find_html_files()
+    inputs = [*html_files, *(f.with_suffix('.docs.md') for f in html_files),
+              Path(__file__), Path(__file__).with_name('site_utils.py')]
+    use_llm = llm_enabled()
+    fingerprint = inputs_fingerprint(inputs, extra=[f'llm={use_llm}'])
+    if build_is_current('gather-stamp', fingerprint, output_path):
+        print(f"✓ Sources unchanged; keeping {output_path}")
+        return
+
     tools = gather_tools()
 
     # Write to JSON for other build scripts
-    output_path = Path('tools.json')
-    with output_path.open('w', encoding='utf-8') as f:
-        json.dump(
-            [asdict(tool) for tool in tools],
-            f,
-            indent=2,
-            ensure_ascii=False
-        )
+    payload = [tool.to_dict() for tool in tools]
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(payload, indent=2, ensure_ascii=False).encode('utf-8')
 
-    print(f"✓ Wrote {len(tools)} tool(s) to {output_path}")
+    # Leave an identical file untouched so its mtime (an index input) holds
+    try:
+        unchanged = output_path.read_bytes() == data
+    except FileNotFoundError:
+        unchanged = False
+    if not unchanged:
+        output_path.write_bytes(data)
+
+    # With the LLM available, a placeholder means a failed request; don't
+    # stamp so it is retried. Without it, rerunning can't change anything.
+    unresolved = [tool.slug for tool in tools if tool.description == NO_DESCRIPTION]
+    if use_llm and unresolved:
+        print(f"  {len(unresolved)} tool(s) without a description; not stamping the build")
+        clear_build_stamp('gather-stamp')
+    else:
+        write_build_stamp('gather-stamp', fingerprint)
+
+    if unchanged:
+        print(f"✓ {output_path} already up to date ({len(tools)} tool(s))")
+    else:
+        print(f"✓ Wrote {len(tools)} tool(s) to {output_path}")
 
 
 if __name__ == '__main__':
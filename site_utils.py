@@ -0,0 +1,187 @@
+"""Shared helpers for the site build scripts."""
+import hashlib
+import os
+import re
+from itertools import chain
+from pathlib import Path
+from typing import Iterable
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
+CACHE_DIR = Path('.cache')
+
+TITLE_RE = re.compile(rb'<title>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+TITLE_SCAN_BYTES = 8192  # <title> lives in <head>, well inside the first few KB
+
+
+def load_config() -> dict:
+    """Load configuration from _config.yml."""
+    config_path = Path('_config.yml')
+    if not config_path.exists():
+        return {}
+
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
+
+
+def find_html_files() -> list[Path]:
+    """Find tool HTML files in the current directory.
+
+    Uses os.scandir so names and file types come from one directory read,
+    without a Path object or stat per entry until the list is built.
+
+    Returns:
+        Sorted list of tool HTML paths (index.html excluded)
+    """
+    with os.scandir('.') as entries:
+        names = sorted(
+            entry.name for entry in entries
+            if entry.name.endswith('.html') and entry.name != 'index.html'
+            and entry.is_file()
+        )
+
+    return [Path(name) for name in names]
+
+
+def extract_title(html_path: Path) -> str:
+    """Extract title from HTML <title> tag."""
+    try:
+        with html_path.open('rb') as f:
+            head = f.read(TITLE_SCAN_BYTES)
+            match = TITLE_RE.search(head)
+            if not match and len(head) == TITLE_SCAN_BYTES:
+                # Title not in the prefix (or split across it); scan the rest
+                match = TITLE_RE.search(head + f.read())
+        if match:
+            return match.group(1).decode('utf-8', 'replace').strip()
+    except Exception as e:
+        print(f"Warning: Could not extract title from {html_path}: {e}")
+
+    # Fallback to filename
+    return html_path.stem.replace('-', ' ').title()
+
+
+def parse_frontmatter(content: str) -> tuple[dict, str]:
+    """Parse YAML frontmatter from markdown content.
+
+    Returns:
+        Tuple of (frontmatter_dict, remaining_content)
+    """
+    if not content.startswith('---'):
+        return {}, content
+
+    try:
+        # Find closing --- at the start of a line; parse only that slice
+        end = content.find('\n---', 3)
+        if end < 0:
+            return {}, content
+
+        frontmatter = yaml.load(content[3:end], Loader=YamlLoader) or {}
+        remaining = content[end + 4:].strip()
+        return frontmatter, remaining
+    except Exception as e:
+        print(f"Warning: Could not parse frontmatter: {e}")
+        return {}, content
+
+
+def extract_description(docs_path: Path) -> tuple[str, dict]:
+    """Extract description and metadata from .docs.md file.
+
+    Returns:
+        Tuple of (description, metadata_dict)
+    """
+    try:
+        # A missing file surfaces as FileNotFoundError; no separate stat
+        with docs_path.open('r', encoding='utf-8') as f:
+            # Read only up to the end of the frontmatter block (if any)
+            head = f.readline()
+            while head and not head.strip():
+                head = f.readline()
+            head = head.lstrip()  # as if the whole file had been stripped
+            if head.startswith('---'):
+                for line in f:
+                    head += line
+                    if line.startswith('---'):
+                        break
+            frontmatter, body = parse_frontmatter(head)
+
+            # Stream the rest until the first non-empty, non-heading line
+            for line in chain(body.splitlines(), f):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    return line, frontmatter
+
+        return "", frontmatter
+    except FileNotFoundError:
+        return "", {}
+    except Exception as e:
+        print(f"Warning: Could not read {docs_path}: {e}")
+        return "", {}
+
+
+def inputs_fingerprint(paths: Iterable[Path], extra: Iterable[str] = ()) -> str:
+    """Fingerprint files by name, size and mtime (stat only, no reads).
+
+    Args:
+        paths: Input files of a build step; missing ones are ignored
+        extra: Non-file inputs (e.g. environment state) that affect the output
+
+    Returns:
+        Hex digest that changes when any file is added, removed or modified
+    """
+    digest = hashlib.sha256()
+    for item in extra:
+        digest.update(f'{item}\n'.encode('utf-8'))
+    for path in sorted(set(paths)):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f'{path}\0{st.st_size}\0{st.st_mtime_ns}\n'.encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def build_is_current(stamp_name: str, fingerprint: str, *outputs: Path) -> bool:
+    """Check whether a build step can be skipped.
+
+    A step is current when all its outputs exist and the stamp written by
+    its last run matches the fingerprint. Set BUILD_FORCE=1 to always
+    rebuild.
+
+    Args:
+        stamp_name: Stamp file name inside .cache/
+        fingerprint: Fingerprint of the step's current inputs
+        outputs: Files the step produces
+
+    Returns:
+        True if the previous outputs are still valid
+    """
+    if os.environ.get('BUILD_FORCE') == '1':
+        return False
+    if not all(output.exists() for output in outputs):
+        return False
+
+    try:
+        return (CACHE_DIR / stamp_name).read_text('utf-8') == fingerprint
+    except OSError:
+        return False
+
+
+def write_build_stamp(stamp_name: str, fingerprint: str):
+    """Record the input fingerprint of a completed build step."""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        (CACHE_DIR / stamp_name).write_text(fingerprint, 'utf-8')
+    except OSError as e:
+        print(f"Warning: Could not write build stamp: {e}")
+
+
+def clear_build_stamp(stamp_name: str):
+    """Forget the last run of a build step so the next one rebuilds."""
+    (CACHE_DIR / stamp_name).unlink(missing_ok=True)